@@ -1,17 +1,25 @@
 import os
 import json
 import logging
+import uuid
 from datetime import datetime, timedelta
 from functools import wraps
 from typing import Dict, Any, List
 
+import orjson
 from flask import Flask, request, jsonify, send_from_directory
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from werkzeug.utils import secure_filename
 from werkzeug.exceptions import RequestEntityTooLarge
-import bleach
+from asgiref.wsgi import WsgiToAsgi
+try:
+    import nh3  # Rust-backed sanitizer (ammonia), much faster than bleach
+except ImportError:
+    nh3 = None
+    import bleach
 from dotenv import load_dotenv
 
 # Import custom modules
@@ -21,22 +29,39 @@ from services.case_service import CaseService
 from services.jurisprudence_service import JurisprudenceService
 from utils.security import SecurityUtils
 from utils.validators import InputValidator
+from tasks import celery_app, run_analysis, run_mindmap, run_contract_analysis
 
 # Load environment variables
 load_dotenv('../config/.env')
 
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson (SIMD-accelerated Rust implementation)"""
+
+    def dumps(self, obj: Any, **kwargs) -> str:
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs) -> Any:
+        return orjson.loads(s)
+
+class JurisAIFlask(Flask):
+    json_provider_class = OrjsonProvider
+
 # Initialize Flask app
-app = Flask(__name__)
+app = JurisAIFlask(__name__)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
 app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_UPLOAD_SIZE', 10485760))  # 10MB default
 
 # Configure CORS
 CORS(app, origins=os.getenv('ALLOWED_ORIGINS', 'http://localhost:3000,http://localhost:53777').split(','))
 
-# Configure rate limiting
+# Configure rate limiting; Redis storage keeps limits consistent across
+# workers and survives restarts, with in-memory fallback when unavailable
 limiter = Limiter(
     key_func=get_remote_address,
-    default_limits=["100 per hour"]
+    default_limits=["100 per hour"],
+    storage_uri=os.getenv('RATELIMIT_STORAGE_URL', os.getenv('REDIS_URL', 'memory://')),
+    strategy='moving-window',
+    in_memory_fallback_enabled=True
 )
 limiter.init_app(app)
 
@@ -58,9 +83,20 @@ input_validator = InputValidator()
 # Upload configuration
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'.pdf', '.docx', '.doc', '.txt'}
+# 1 MiB chunks keep syscall count low while bounding memory per upload
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# exist_ok makes this atomic across gunicorn workers racing at import
+os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
+# AI work is dispatched to Celery workers when a broker is configured;
+# without one the endpoints fall back to inline (blocking) execution
+CELERY_ENABLED = bool(os.getenv('CELERY_BROKER_URL'))
+
+def _build_upload_path(original_filename: str) -> str:
+    """Build a unique upload path; a uuid prefix is cheaper than strftime
+    and cannot collide within the same second"""
+    return f"{UPLOAD_FOLDER}/{uuid.uuid4().hex[:16]}_{secure_filename(original_filename)}"
 
 def require_api_key(f):
     """Decorator to require API key for sensitive endpoints"""
@@ -72,15 +108,49 @@ def require_api_key(f):
         return f(*args, **kwargs)
     return decorated_function
 
-def sanitize_input(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Sanitize input data to prevent XSS and injection attacks"""
-    if isinstance(data, dict):
-        return {k: sanitize_input(v) for k, v in data.items()}
-    elif isinstance(data, list):
-        return [sanitize_input(item) for item in data]
-    elif isinstance(data, str):
-        return bleach.clean(data, tags=[], attributes={}, strip=True)
-    return data
+# Analysis types accepted by /api/documents/<id>/analyze
+VALID_ANALYSIS_TYPES = {'general', 'synthesis', 'qa'}
+
+# User-provided text fields that flow into HTML or LLM prompts
+USER_TEXT_FIELDS = frozenset({'message', 'query', 'caseNumber', 'court'})
+
+def sanitize_text(value: str) -> str:
+    """Sanitize a single user-provided string to prevent XSS and injection attacks"""
+    if not isinstance(value, str):
+        return ''
+    if nh3 is not None:
+        return nh3.clean(value, tags=set(), attributes={})
+    return bleach.clean(value, tags=[], attributes={}, strip=True)
+
+def _sanitizing_hook(obj: Dict[str, Any]) -> Dict[str, Any]:
+    """object_hook that cleans user text fields while the parser builds each dict"""
+    for key in USER_TEXT_FIELDS.intersection(obj):
+        value = obj[key]
+        if isinstance(value, str):
+            obj[key] = sanitize_text(value)
+    return obj
+
+def get_sanitized_json() -> Dict[str, Any]:
+    """Parse the request body, sanitizing user text fields in the same pass.
+
+    The object_hook runs during parsing, so each dict is visited exactly
+    once instead of being walked again after decode.
+    """
+    raw = request.get_data(cache=False)
+    if not raw:
+        return {}
+    try:
+        data = json.loads(raw, object_hook=_sanitizing_hook)
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+@app.before_request
+def reject_oversized_bodies():
+    """413 on oversized bodies before the body parser consumes anything"""
+    content_length = request.content_length
+    if content_length and content_length > app.config['MAX_CONTENT_LENGTH']:
+        return jsonify({'error': 'File too large. Maximum size is 10MB.'}), 413
 
 @app.errorhandler(RequestEntityTooLarge)
 def handle_file_too_large(e):
@@ -109,9 +179,36 @@ def health_check():
 @limiter.limit("10 per minute")
 def upload_document():
     try:
+        # Raw octet-stream bodies are streamed straight to disk in chunks,
+        # skipping the multipart parser's in-memory/spool buffering entirely
+        if request.content_type and request.content_type.startswith('application/octet-stream'):
+            original_filename = request.headers.get('X-Filename', '')
+            if not original_filename:
+                return jsonify({'error': 'X-Filename header is required'}), 400
+
+            if not security_utils.validate_file_type(original_filename, ALLOWED_EXTENSIONS):
+                return jsonify({'error': 'Invalid file type or size'}), 400
+
+            filepath = _build_upload_path(original_filename)
+
+            with open(filepath, 'wb') as f:
+                while True:
+                    chunk = request.stream.read(UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+
+            document_id = document_service.process_document(filepath, original_filename)
+
+            return jsonify({
+                'id': document_id,
+                'status': 'uploaded',
+                'filename': original_filename
+            })
+
         if 'file' not in request.files:
             return jsonify({'error': 'No file provided'}), 400
-        
+
         file = request.files['file']
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
@@ -120,13 +217,8 @@ def upload_document():
         if not input_validator.validate_file(file, ALLOWED_EXTENSIONS):
             return jsonify({'error': 'Invalid file type or size'}), 400
         
-        # Secure filename
-        filename = secure_filename(file.filename)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
-        filename = timestamp + filename
-        
-        # Save file
-        filepath = os.path.join(UPLOAD_FOLDER, filename)
+        # Save file under a collision-free name
+        filepath = _build_upload_path(file.filename)
         file.save(filepath)
         
         # Process document
@@ -146,23 +238,30 @@ def upload_document():
 @limiter.limit("5 per minute")
 def analyze_document(document_id):
     try:
-        data = sanitize_input(request.get_json() or {})
+        data = request.get_json() or {}
         analysis_type = data.get('analysisType', 'general')
-        
+
+        if analysis_type not in VALID_ANALYSIS_TYPES:
+            return jsonify({'error': 'Invalid analysis type'}), 400
+
         if not input_validator.validate_document_id(document_id):
             return jsonify({'error': 'Invalid document ID'}), 400
-        
+
+        if CELERY_ENABLED:
+            task = run_analysis.delay(document_id, analysis_type)
+            return jsonify({'task_id': task.id, 'status': 'pending'}), 202
+
         # Get document content
         document_content = document_service.get_document_content(document_id)
         if not document_content:
             return jsonify({'error': 'Document not found'}), 404
-        
+
         # Perform analysis
         analysis_result = ai_service.analyze_document(document_content, analysis_type)
-        
+
         # Store analysis result
         document_service.store_analysis(document_id, analysis_result)
-        
+
         return jsonify(analysis_result)
         
     except Exception as e:
@@ -175,25 +274,86 @@ def generate_mindmap(document_id):
     try:
         if not input_validator.validate_document_id(document_id):
             return jsonify({'error': 'Invalid document ID'}), 400
-        
+
+        if CELERY_ENABLED:
+            task = run_mindmap.delay(document_id)
+            return jsonify({'task_id': task.id, 'status': 'pending'}), 202
+
         document_content = document_service.get_document_content(document_id)
         if not document_content:
             return jsonify({'error': 'Document not found'}), 404
-        
+
         mindmap_data = ai_service.generate_mindmap(document_content)
-        
+
         return jsonify(mindmap_data)
         
     except Exception as e:
         logger.error(f"Mindmap generation error: {str(e)}")
         return jsonify({'error': 'Mindmap generation failed'}), 500
 
+# Batch document analysis endpoint
+@app.route('/api/documents/batch/analyze', methods=['POST'])
+@limiter.limit("2 per minute")
+def analyze_documents_batch():
+    try:
+        data = request.get_json() or {}
+        document_ids = data.get('documentIds', [])
+        analysis_type = data.get('analysisType', 'general')
+
+        if analysis_type not in VALID_ANALYSIS_TYPES:
+            return jsonify({'error': 'Invalid analysis type'}), 400
+
+        if not isinstance(document_ids, list) or not document_ids or len(document_ids) > 20:
+            return jsonify({'error': 'documentIds must be a list of 1 to 20 document IDs'}), 400
+
+        for document_id in document_ids:
+            if not input_validator.validate_document_id(document_id):
+                return jsonify({'error': f'Invalid document ID: {document_id}'}), 400
+
+        contents = {}
+        for document_id in document_ids:
+            content = document_service.get_document_content(document_id)
+            if not content:
+                return jsonify({'error': f'Document not found: {document_id}'}), 404
+            contents[document_id] = content
+
+        # All N OpenAI calls are in flight concurrently, so wall time is
+        # ~one round trip instead of N sequential ones
+        analyses = ai_service.analyze_documents_batch(list(contents.values()), analysis_type)
+
+        results = {}
+        for document_id, analysis_result in zip(contents.keys(), analyses):
+            document_service.store_analysis(document_id, analysis_result)
+            results[document_id] = analysis_result
+
+        return jsonify({'results': results})
+
+    except Exception as e:
+        logger.error(f"Batch analysis error: {str(e)}")
+        return jsonify({'error': 'Batch analysis failed'}), 500
+
+# Task status endpoint (for Celery-dispatched work)
+@app.route('/api/tasks/<task_id>', methods=['GET'])
+def get_task_status(task_id):
+    try:
+        result = celery_app.AsyncResult(task_id)
+        payload = {'task_id': task_id, 'state': result.state}
+        if result.successful():
+            payload['result'] = result.result
+        elif result.failed():
+            payload['error'] = str(result.result)
+        return jsonify(payload)
+
+    except Exception as e:
+        logger.error(f"Task status error: {str(e)}")
+        return jsonify({'error': 'Task status unavailable'}), 500
+
 # Chat endpoint
 @app.route('/api/chat', methods=['POST'])
 @limiter.limit("20 per minute")
 def chat():
     try:
-        data = sanitize_input(request.get_json() or {})
+        data = get_sanitized_json()
         message = data.get('message', '').strip()
         context = data.get('context', {})
         
@@ -220,7 +380,7 @@ def chat():
 @limiter.limit("10 per minute")
 def search_case():
     try:
-        data = sanitize_input(request.get_json() or {})
+        data = get_sanitized_json()
         case_number = data.get('caseNumber', '').strip()
         court = data.get('court', '').strip()
         
@@ -239,6 +399,41 @@ def search_case():
         logger.error(f"Case search error: {str(e)}")
         return jsonify({'error': 'Case search failed'}), 500
 
+# Batch case search endpoint
+@app.route('/api/cases/batch', methods=['POST'])
+@limiter.limit("5 per minute")
+def search_cases_batch():
+    try:
+        data = get_sanitized_json()
+        cases = data.get('cases', [])
+
+        if not isinstance(cases, list) or not cases or len(cases) > 20:
+            return jsonify({'error': 'cases must be a list of 1 to 20 entries'}), 400
+
+        queries = []
+        for entry in cases:
+            if not isinstance(entry, dict):
+                return jsonify({'error': 'Each case entry must be an object'}), 400
+
+            case_number = entry.get('caseNumber', '').strip()
+            court = entry.get('court', '').strip()
+
+            if not case_number or not court:
+                return jsonify({'error': 'Case number and court are required for every entry'}), 400
+
+            if not input_validator.validate_case_number(case_number):
+                return jsonify({'error': f'Invalid case number format: {case_number}'}), 400
+
+            queries.append((case_number, court))
+
+        results = case_service.search_cases_batch(queries)
+
+        return jsonify({'results': results, 'total': len(results)})
+
+    except Exception as e:
+        logger.error(f"Batch case search error: {str(e)}")
+        return jsonify({'error': 'Case search failed'}), 500
+
 # Contract analysis endpoint
 @app.route('/api/contracts/<document_id>/analyze', methods=['POST'])
 @limiter.limit("5 per minute")
@@ -246,14 +441,18 @@ def analyze_contract(document_id):
     try:
         if not input_validator.validate_document_id(document_id):
             return jsonify({'error': 'Invalid document ID'}), 400
-        
+
+        if CELERY_ENABLED:
+            task = run_contract_analysis.delay(document_id)
+            return jsonify({'task_id': task.id, 'status': 'pending'}), 202
+
         document_content = document_service.get_document_content(document_id)
         if not document_content:
             return jsonify({'error': 'Document not found'}), 404
-        
+
         # Perform contract analysis
         analysis_result = ai_service.analyze_contract(document_content)
-        
+
         return jsonify(analysis_result)
         
     except Exception as e:
@@ -265,7 +464,7 @@ def analyze_contract(document_id):
 @limiter.limit("10 per minute")
 def search_jurisprudence():
     try:
-        data = sanitize_input(request.get_json() or {})
+        data = get_sanitized_json()
         query = data.get('query', '').strip()
         filters = data.get('filters', {})
         
@@ -293,6 +492,13 @@ def search_jurisprudence():
 def serve_config(filename):
     return send_from_directory('../config', filename)
 
+# ASGI entry point: `uvicorn app:asgi_app` serves the same app under an
+# ASGI server. WsgiToAsgi still runs each request on a threadpool thread
+# (one per in-flight request, same concurrency model as a threaded WSGI
+# server); it does not make the routes async. It exists so the app can sit
+# behind an ASGI deployment today, ahead of any native-async migration.
+asgi_app = WsgiToAsgi(app)
+
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 5000))
     debug = os.getenv('DEBUG', 'false').lower() == 'true'
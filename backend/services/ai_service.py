@@ -1,35 +1,196 @@
 import os
-import json
+import asyncio
+import hashlib
 import logging
+import threading
+import zlib
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+import httpx
 import openai
-from openai import OpenAI
+import orjson
+from openai import OpenAI, AsyncOpenAI
+import redis
 
 logger = logging.getLogger(__name__)
 
+# TTL for cached AI responses (24 hours)
+AI_CACHE_TTL = 86400
+
+# Semantic chat cache: reuse a prior response when the new message embedding
+# is at least this similar (cosine) to a cached one
+SEMANTIC_SIMILARITY_THRESHOLD = 0.85
+SEMANTIC_CACHE_MAX_ENTRIES = 500
+EMBEDDING_MODEL = 'text-embedding-3-small'
+
+# Prompt templates built once at import; '{content}' is substituted per call
+_ANALYSIS_PROMPTS = {
+    'general': """
+            Analise o seguinte documento jurídico brasileiro e forneça:
+            1. Um resumo conciso
+            2. Pontos-chave identificados
+            3. Partes envolvidas
+            4. Datas importantes
+            5. Obrigações principais
+            6. Riscos potenciais
+
+            Documento: {content}
+
+            Responda em formato JSON com as chaves: summary, keyPoints, parties, dates, obligations, risks
+            """,
+    'synthesis': """
+            Faça uma síntese detalhada do seguinte documento jurídico brasileiro:
+
+            Documento: {content}
+
+            Forneça uma análise estruturada em formato JSON.
+            """,
+    'qa': """
+            Prepare-se para responder perguntas sobre o seguinte documento jurídico brasileiro:
+
+            Documento: {content}
+
+            Identifique os principais tópicos que podem gerar perguntas.
+            """
+}
+
+# Shared system messages, reused across calls instead of rebuilt per request
+_ANALYSIS_SYSTEM_MSG = {
+    "role": "system",
+    "content": "Você é um assistente jurídico especializado em direito brasileiro. Sempre responda em português brasileiro. Responda sempre com JSON válido."
+}
+_MINDMAP_SYSTEM_MSG = {
+    "role": "system",
+    "content": "Você é um especialista em organização de informações jurídicas. Responda sempre com JSON válido."
+}
+_CONTRACT_SYSTEM_MSG = {
+    "role": "system",
+    "content": "Você é um advogado especialista em direito contratual brasileiro. Responda sempre com JSON válido."
+}
+
+# Keyword sets for mock chat dispatch, built once at import
+_CONTRACT_KEYWORDS = ('contrato', 'contract')
+_CASE_KEYWORDS = ('processo', 'case')
+_JURISPRUDENCE_KEYWORDS = ('jurisprudência', 'precedente')
+
 class AIService:
     """Service for AI-powered legal analysis and chat functionality"""
-    
+
     def __init__(self):
         self.client = None
+        self.async_client = None
+        self._api_key = None
+        self.cache = None
+        # List of (embedding, document_id, response) tuples for semantic chat caching
+        self._semantic_cache: List[tuple] = []
         self._initialize_client()
-    
+        self._initialize_cache()
+
     def _initialize_client(self):
         """Initialize OpenAI client"""
         api_key = os.getenv('OPENAI_API_KEY')
         if api_key and api_key != 'your_openai_api_key_here':
             try:
-                self.client = OpenAI(api_key=api_key)
+                # Keep-alive pool so warm TLS connections are reused across requests
+                http_client = httpx.Client(
+                    limits=httpx.Limits(max_keepalive_connections=20)
+                )
+                self.client = OpenAI(api_key=api_key, http_client=http_client)
+                self.async_client = AsyncOpenAI(api_key=api_key)
+                self._api_key = api_key
+                threading.Thread(target=self._warm_up, daemon=True).start()
                 logger.info("OpenAI client initialized successfully")
             except Exception as e:
                 logger.error(f"Failed to initialize OpenAI client: {e}")
                 self.client = None
+                self.async_client = None
         else:
             logger.warning("OpenAI API key not configured, using mock responses")
             self.client = None
-    
+            self.async_client = None
+
+    def _warm_up(self):
+        """Open a connection to OpenAI at startup so the first user request
+        does not pay the TCP+TLS handshake"""
+        try:
+            self.client.models.retrieve("gpt-3.5-turbo")
+            logger.info("OpenAI connection pool warmed up")
+        except Exception as e:
+            logger.warning(f"OpenAI warm-up failed: {e}")
+
+    def _initialize_cache(self):
+        """Initialize Redis cache for AI responses"""
+        redis_url = os.getenv('REDIS_URL')
+        if not redis_url:
+            logger.info("REDIS_URL not configured, AI response caching disabled")
+            return
+        try:
+            self.cache = redis.Redis.from_url(redis_url)
+            self.cache.ping()
+            logger.info("Redis AI response cache initialized")
+        except Exception as e:
+            logger.warning(f"Redis cache unavailable, AI responses will not be cached: {e}")
+            self.cache = None
+
+    def _cache_key(self, method: str, content: str, extra: str = '') -> str:
+        """Build a cache key from a content hash"""
+        digest = hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+        return f"ai:{method}:{digest}:{extra}"
+
+    def _cache_get(self, key: str) -> Optional[Any]:
+        """Get a cached AI response, or None on miss"""
+        if not self.cache:
+            return None
+        try:
+            raw = self.cache.get(key)
+            if raw:
+                return orjson.loads(raw)
+        except Exception as e:
+            logger.warning(f"AI cache read error: {e}")
+        return None
+
+    def _cache_set(self, key: str, value: Any, ttl: int = AI_CACHE_TTL):
+        """Store an AI response in the cache"""
+        if not self.cache:
+            return
+        try:
+            self.cache.setex(key, ttl, orjson.dumps(value))
+        except Exception as e:
+            logger.warning(f"AI cache write error: {e}")
+
+    def _embed_message(self, message: str) -> Optional[List[float]]:
+        """Compute an embedding for a chat message"""
+        try:
+            response = self.client.embeddings.create(model=EMBEDDING_MODEL, input=message)
+            return response.data[0].embedding
+        except Exception as e:
+            logger.warning(f"Embedding error, skipping semantic cache: {e}")
+            return None
+
+    def _semantic_lookup(self, embedding: List[float], document_id: str) -> Optional[str]:
+        """Find a cached response whose message embedding is similar enough"""
+        best_score = 0.0
+        best_response = None
+        for cached_embedding, cached_doc_id, cached_response in self._semantic_cache:
+            if cached_doc_id != document_id:
+                continue
+            # OpenAI embeddings are unit-normalized, so dot product == cosine
+            score = sum(a * b for a, b in zip(embedding, cached_embedding))
+            if score > best_score:
+                best_score = score
+                best_response = cached_response
+        if best_score >= SEMANTIC_SIMILARITY_THRESHOLD:
+            logger.info(f"Semantic cache hit (similarity {best_score:.3f})")
+            return best_response
+        return None
+
+    def _semantic_store(self, embedding: List[float], document_id: str, response: str):
+        """Store a (embedding, response) pair for future semantic lookups"""
+        self._semantic_cache.append((embedding, document_id, response))
+        if len(self._semantic_cache) > SEMANTIC_CACHE_MAX_ENTRIES:
+            self._semantic_cache.pop(0)
+
     def analyze_document(self, content: str, analysis_type: str = 'general') -> Dict[str, Any]:
         """Analyze a legal document"""
         try:
@@ -41,70 +202,101 @@ class AIService:
             logger.error(f"Document analysis error: {e}")
             return self._mock_document_analysis(content, analysis_type)
     
+    def _analysis_prompt(self, content: str, analysis_type: str) -> str:
+        """Build the analysis prompt for a document"""
+        template = _ANALYSIS_PROMPTS.get(analysis_type, _ANALYSIS_PROMPTS['general'])
+        return template.replace('{content}', content[:4000])
+
     def _analyze_document_with_ai(self, content: str, analysis_type: str) -> Dict[str, Any]:
         """Analyze document using OpenAI"""
-        prompts = {
-            'general': """
-            Analise o seguinte documento jurídico brasileiro e forneça:
-            1. Um resumo conciso
-            2. Pontos-chave identificados
-            3. Partes envolvidas
-            4. Datas importantes
-            5. Obrigações principais
-            6. Riscos potenciais
-            
-            Documento: {content}
-            
-            Responda em formato JSON com as chaves: summary, keyPoints, parties, dates, obligations, risks
-            """,
-            'synthesis': """
-            Faça uma síntese detalhada do seguinte documento jurídico brasileiro:
-            
-            Documento: {content}
-            
-            Forneça uma análise estruturada em formato JSON.
-            """,
-            'qa': """
-            Prepare-se para responder perguntas sobre o seguinte documento jurídico brasileiro:
-            
-            Documento: {content}
-            
-            Identifique os principais tópicos que podem gerar perguntas.
-            """
-        }
-        
-        prompt = prompts.get(analysis_type, prompts['general']).format(content=content[:4000])
-        
+        cache_key = self._cache_key('analyze_document', content, analysis_type)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        prompt = self._analysis_prompt(content, analysis_type)
+
         try:
             response = self.client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
-                    {"role": "system", "content": "Você é um assistente jurídico especializado em direito brasileiro. Sempre responda em português brasileiro."},
+                    _ANALYSIS_SYSTEM_MSG,
                     {"role": "user", "content": prompt}
                 ],
                 max_tokens=1500,
-                temperature=0.3
+                temperature=0.3,
+                response_format={"type": "json_object"}
             )
             
-            result = response.choices[0].message.content
-            
-            # Try to parse as JSON, fallback to structured text
-            try:
-                return json.loads(result)
-            except json.JSONDecodeError:
-                return {
-                    'summary': result[:500],
-                    'keyPoints': [result[500:1000]] if len(result) > 500 else [],
-                    'parties': [],
-                    'dates': [],
-                    'obligations': [],
-                    'risks': []
-                }
-                
+            parsed = orjson.loads(response.choices[0].message.content)
+            self._cache_set(cache_key, parsed)
+            return parsed
+
+        except Exception as e:
+            logger.error(f"OpenAI API error: {e}")
+            return self._mock_document_analysis(content, analysis_type)
+
+    async def analyze_document_async(
+        self, content: str, analysis_type: str = 'general',
+        client: Optional[AsyncOpenAI] = None
+    ) -> Dict[str, Any]:
+        """Async variant of analyze_document for ASGI/event-loop callers"""
+        client = client or self.async_client
+        if not client:
+            return self._mock_document_analysis(content, analysis_type)
+
+        cache_key = self._cache_key('analyze_document', content, analysis_type)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        prompt = self._analysis_prompt(content, analysis_type)
+
+        try:
+            response = await client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[
+                    _ANALYSIS_SYSTEM_MSG,
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=1500,
+                temperature=0.3,
+                response_format={"type": "json_object"}
+            )
+
+            parsed = orjson.loads(response.choices[0].message.content)
+            self._cache_set(cache_key, parsed)
+            return parsed
+
         except Exception as e:
             logger.error(f"OpenAI API error: {e}")
             return self._mock_document_analysis(content, analysis_type)
     
+    async def analyze_documents_async(
+        self, contents: List[str], analysis_type: str = 'general',
+        client: Optional[AsyncOpenAI] = None
+    ) -> List[Dict[str, Any]]:
+        """Analyze several documents concurrently on one event loop"""
+        return list(await asyncio.gather(
+            *[self.analyze_document_async(content, analysis_type, client) for content in contents]
+        ))
+
+    async def _run_batch(self, contents: List[str], analysis_type: str) -> List[Dict[str, Any]]:
+        # The async client's httpx pool binds to the running event loop, and
+        # asyncio.run creates a fresh loop per call; a per-batch client keeps
+        # connection reuse within the batch without outliving its loop
+        if self._api_key is None:
+            return await self.analyze_documents_async(contents, analysis_type)
+        client = AsyncOpenAI(api_key=self._api_key)
+        try:
+            return await self.analyze_documents_async(contents, analysis_type, client)
+        finally:
+            await client.close()
+
+    def analyze_documents_batch(self, contents: List[str], analysis_type: str = 'general') -> List[Dict[str, Any]]:
+        """Synchronous entry point for batch analysis from WSGI routes"""
+        return asyncio.run(self._run_batch(contents, analysis_type))
+
     def _mock_document_analysis(self, content: str, analysis_type: str) -> Dict[str, Any]:
         """Mock document analysis for development/fallback"""
         return {
@@ -141,6 +333,11 @@ class AIService:
     
     def _generate_mindmap_with_ai(self, content: str) -> Dict[str, Any]:
         """Generate mindmap using AI"""
+        cache_key = self._cache_key('generate_mindmap', content)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         prompt = f"""
         Crie um mapa mental hierárquico do seguinte documento jurídico brasileiro.
         Organize as informações em categorias principais e subcategorias.
@@ -162,16 +359,19 @@ class AIService:
             response = self.client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
-                    {"role": "system", "content": "Você é um especialista em organização de informações jurídicas."},
+                    _MINDMAP_SYSTEM_MSG,
                     {"role": "user", "content": prompt}
                 ],
                 max_tokens=1000,
-                temperature=0.3
+                temperature=0.3,
+                response_format={"type": "json_object"}
             )
             
             result = response.choices[0].message.content
-            return json.loads(result)
-            
+            parsed = orjson.loads(result)
+            self._cache_set(cache_key, parsed)
+            return parsed
+
         except Exception as e:
             logger.error(f"AI mindmap generation error: {e}")
             return self._mock_mindmap(content)
@@ -228,6 +428,11 @@ class AIService:
     
     def _analyze_contract_with_ai(self, content: str) -> Dict[str, Any]:
         """Analyze contract using AI with Brazilian law focus"""
+        cache_key = self._cache_key('analyze_contract', content)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         prompt = f"""
         Analise o seguinte contrato conforme a legislação brasileira (Código Civil, CDC, etc.):
         
@@ -245,16 +450,19 @@ class AIService:
             response = self.client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
-                    {"role": "system", "content": "Você é um advogado especialista em direito contratual brasileiro."},
+                    _CONTRACT_SYSTEM_MSG,
                     {"role": "user", "content": prompt}
                 ],
                 max_tokens=2000,
-                temperature=0.2
+                temperature=0.2,
+                response_format={"type": "json_object"}
             )
             
             result = response.choices[0].message.content
-            return json.loads(result)
-            
+            parsed = orjson.loads(result)
+            self._cache_set(cache_key, parsed)
+            return parsed
+
         except Exception as e:
             logger.error(f"AI contract analysis error: {e}")
             return self._mock_contract_analysis(content)
@@ -320,6 +528,19 @@ class AIService:
     
     def _generate_chat_response_with_ai(self, message: str, context: Dict[str, Any] = None) -> str:
         """Generate chat response using AI"""
+        document_id = (context or {}).get('documentId', '')
+        cache_key = self._cache_key('chat', message, str(document_id))
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Exact-hash miss: paraphrased questions can still hit the semantic cache
+        embedding = self._embed_message(message)
+        if embedding is not None:
+            similar = self._semantic_lookup(embedding, str(document_id))
+            if similar is not None:
+                return similar
+
         system_prompt = """
         Você é um assistente jurídico especializado em direito brasileiro.
         Forneça respostas precisas, profissionais e úteis.
@@ -347,8 +568,12 @@ class AIService:
                 temperature=0.4
             )
             
-            return response.choices[0].message.content
-            
+            result = response.choices[0].message.content
+            self._cache_set(cache_key, result)
+            if embedding is not None:
+                self._semantic_store(embedding, str(document_id), result)
+            return result
+
         except Exception as e:
             logger.error(f"AI chat error: {e}")
             return self._mock_chat_response(message, context)
@@ -362,12 +587,13 @@ class AIService:
             "Posso ajudá-lo com essa questão jurídica. Recomendo que consultemos a documentação relevante e a jurisprudência aplicável ao caso."
         ]
         
-        # Simple keyword-based response selection
-        if any(word in message.lower() for word in ['contrato', 'contract']):
+        # Simple keyword-based response selection (lowercase once, scan once per set)
+        message_lower = message.lower()
+        if any(word in message_lower for word in _CONTRACT_KEYWORDS):
             return "Para análise de contratos, recomendo usar a funcionalidade específica de análise contratual, que verifica a conformidade com a legislação brasileira."
-        elif any(word in message.lower() for word in ['processo', 'case']):
+        elif any(word in message_lower for word in _CASE_KEYWORDS):
             return "Para consulta de processos, você pode usar a busca de processos que acessa informações dos tribunais brasileiros."
-        elif any(word in message.lower() for word in ['jurisprudência', 'precedente']):
+        elif any(word in message_lower for word in _JURISPRUDENCE_KEYWORDS):
             return "A pesquisa de jurisprudência pode ajudá-lo a encontrar precedentes relevantes nos tribunais superiores e estaduais."
         
-        return responses[hash(message) % len(responses)]
\ No newline at end of file
+        return responses[zlib.crc32(message.encode('utf-8')) % len(responses)]
\ No newline at end of file
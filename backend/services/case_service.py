@@ -1,58 +1,334 @@
 import os
+import asyncio
 import logging
+import re
+import threading
+import time
+import aiohttp
+import msgpack
+import redis
 import requests
+from requests.adapters import HTTPAdapter
+from cachetools import TTLCache
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 import json
 
 logger = logging.getLogger(__name__)
 
+# Cap on concurrent DataJud lookups so batch searches respect upstream limits
+DATAJUD_MAX_CONCURRENCY = 10
+
+# Active cases mutate, so their cache is short-lived; court metadata and
+# statistics are nearly static and can live for a day. After CASE_CACHE_TTL
+# an entry is stale but still served for CASE_CACHE_GRACE while a background
+# refresh runs (stale-while-revalidate), so popular cases never block on the
+# DataJud round-trip
+CASE_CACHE_TTL = 60
+CASE_CACHE_GRACE = 600
+META_CACHE_TTL = 86400
+
+# Court id -> full name map, built once at import
+_COURT_NAMES = {
+    'tjsp': 'Tribunal de Justiça de São Paulo',
+    'stj': 'Superior Tribunal de Justiça',
+    'stf': 'Supremo Tribunal Federal',
+    'trf1': 'Tribunal Regional Federal da 1ª Região',
+    'trf2': 'Tribunal Regional Federal da 2ª Região',
+    'trf3': 'Tribunal Regional Federal da 3ª Região',
+    'trf4': 'Tribunal Regional Federal da 4ª Região',
+    'trf5': 'Tribunal Regional Federal da 5ª Região',
+    'tst': 'Tribunal Superior do Trabalho'
+}
+
+# Brazilian case number format: NNNNNNN-DD.AAAA.J.TR.OOOO
+# Where N=sequential, D=verification digits, A=year, J=judicial segment,
+# T=court, R=region, O=origin
+_CASE_NUMBER_RE = re.compile(r'^\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}$')
+
+# Movement classification: one alternation scan instead of several substring
+# passes; the matched group index selects the category
+_MOVEMENT_RE = re.compile(r'(sentença|decisão|acórdão)|(audiência|sessão)|(prazo|intimação)', re.IGNORECASE)
+_MOVEMENT_TYPES = ('decision', 'hearing', 'deadline')
+
+# Fallback strptime formats for dates datetime.fromisoformat cannot handle
+_DATE_FORMATS = (
+    '%d/%m/%Y %H:%M:%S',
+    '%d/%m/%Y',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d'
+)
+
+# Mock timeline/deadline skeletons built once at import; only the dates are
+# stamped per call, from a single datetime.now() reading
+_MOCK_TIMELINE = (
+    ('1', -60, 'Distribuição do processo', 'filing'),
+    ('2', -45, 'Citação da parte requerida', 'filing'),
+    ('3', -30, 'Apresentação de contestação', 'filing'),
+    ('4', -15, 'Despacho saneador', 'decision'),
+    ('5', -5, 'Designação de audiência de instrução', 'hearing')
+)
+_MOCK_DEADLINES = (
+    ('1', 10, 'Audiência de instrução e julgamento', 'high'),
+    ('2', 25, 'Prazo para alegações finais', 'medium'),
+    ('3', 40, 'Prazo para sentença', 'low')
+)
+_DATAJUD_DEADLINES = (
+    ('1', 15, 'Prazo para manifestação', 'medium'),
+    ('2', 30, 'Audiência de instrução', 'high')
+)
+
+def _msgpack_default(obj):
+    """Give naive datetimes a zone so they pack as msgpack timestamps.
+
+    Everything this service stamps comes from datetime.now(), which is
+    naive; without a zone the packer would hand it to default=str and a
+    cache hit would return string dates while a miss returned datetime
+    objects. astimezone() attaches the local offset so the timestamp
+    extension round-trips them as datetimes in both tiers.
+    """
+    if isinstance(obj, datetime):
+        return obj.astimezone()
+    return str(obj)
+
 class CaseService:
     """Service for Brazilian court case search and information retrieval"""
-    
+
     def __init__(self):
         self.datajud_api_key = os.getenv('DATAJUD_API_KEY')
         self.datajud_base_url = os.getenv('DATAJUD_BASE_URL', 'https://api-publica.datajud.cnj.jus.br')
         self.timeout = 30
-        self.cache = {}  # Simple in-memory cache
+        # Bounded TTL caches: expired/LRU entries evict in O(1) and memory
+        # stays capped in long-running workers. Redis, when reachable, makes
+        # the cache process-shared so gunicorn workers do not each pay the
+        # DataJud round-trip; these stay as the fallback
+        self.cache = TTLCache(maxsize=10000, ttl=CASE_CACHE_TTL + CASE_CACHE_GRACE)
+        self.meta_cache = TTLCache(maxsize=1000, ttl=META_CACHE_TTL)
+        self._cache_lock = threading.RLock()
+        self.redis = self._initialize_redis()
+        self._refreshing: set = set()  # cache keys with a refresh in flight
+        # Pooled keep-alive session for sync callers: reuses TCP/TLS
+        # connections across DataJud lookups instead of one handshake per call
+        self._http = requests.Session()
+        self._http.mount(
+            'https://',
+            HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=2)
+        )
+        self._http.headers.update({
+            'Authorization': f'Bearer {self.datajud_api_key}',
+            'Content-Type': 'application/json'
+        })
     
+    def _initialize_redis(self) -> Optional[redis.Redis]:
+        """Connect to Redis for a cache shared across workers"""
+        try:
+            redis_url = os.getenv('REDIS_URL')
+            if not redis_url:
+                return None
+            client = redis.Redis.from_url(redis_url)
+            client.ping()
+            logger.info("Case cache backed by Redis")
+            return client
+        except Exception as e:
+            logger.warning(f"Redis unavailable for case cache, using in-memory: {e}")
+            return None
+
+    def _cache_get(self, local_cache: TTLCache, key: str) -> Optional[Dict[str, Any]]:
+        """Read a cached payload from Redis, falling back to the local cache.
+
+        Entries are msgpack blobs in both tiers: packed bytes are compact,
+        invisible to the garbage collector, and round-trip datetimes via the
+        msgpack timestamp extension.
+        """
+        raw = None
+        if self.redis is not None:
+            try:
+                raw = self.redis.get(key)
+            except redis.RedisError as e:
+                logger.warning(f"Redis cache read failed: {e}")
+        if raw is None:
+            with self._cache_lock:
+                raw = local_cache.get(key)
+        if raw is None:
+            return None
+        return msgpack.unpackb(raw, timestamp=3, raw=False)
+
+    def _cache_set(self, local_cache: TTLCache, key: str, value: Dict[str, Any], ttl: int):
+        """Store a payload in Redis (shared) or the local cache (fallback)"""
+        packed = msgpack.packb(
+            value, datetime=True, use_bin_type=True, default=_msgpack_default
+        )
+        if self.redis is not None:
+            try:
+                self.redis.setex(key, ttl, packed)
+                return
+            except redis.RedisError as e:
+                logger.warning(f"Redis cache write failed: {e}")
+        with self._cache_lock:
+            local_cache[key] = packed
+
     def search_case(self, case_number: str, court: str) -> Dict[str, Any]:
-        """Search for case information in Brazilian courts"""
+        """Search for case information in Brazilian courts.
+
+        Cache entries carry a stale_after timestamp: fresh hits return
+        immediately, stale-but-present hits return the old payload and
+        trigger a background refresh, and only a full miss blocks on the
+        upstream round-trip.
+        """
         try:
-            # Check cache first
-            cache_key = f"{case_number}_{court}"
-            if cache_key in self.cache:
-                cached_result = self.cache[cache_key]
-                if datetime.now() - cached_result['timestamp'] < timedelta(hours=1):
+            cache_key = f"case:{court}:{case_number}"
+            entry = self._cache_get(self.cache, cache_key)
+            if entry is not None:
+                if time.time() < entry['stale_after']:
                     logger.info(f"Returning cached result for case {case_number}")
-                    return cached_result['data']
+                    return entry['data']
+                self._schedule_refresh(cache_key, case_number, court)
+                logger.info(f"Returning stale result for case {case_number}, refreshing")
+                return entry['data']
             
-            # Try DataJud API if available
+            result = self._fetch_case(case_number, court)
+            self._store_case(cache_key, result)
+            return result
+            
+        except Exception as e:
+            logger.error(f"Case search error: {e}")
+            return self._mock_case_search(case_number, court)
+    
+    def _fetch_case(self, case_number: str, court: str) -> Dict[str, Any]:
+        """Fetch a case from DataJud (or the mock fallback), bypassing cache"""
+        if self.datajud_api_key and self.datajud_api_key != 'your_datajud_api_key_here':
+            return self._search_with_datajud(case_number, court)
+        return self._mock_case_search(case_number, court)
+    
+    def _store_case(self, cache_key: str, result: Dict[str, Any]):
+        """Cache a case payload wrapped with its staleness deadline"""
+        # Wall-clock, not monotonic: entries travel through Redis and are
+        # compared by whichever worker process reads them
+        entry = {'data': result, 'stale_after': time.time() + CASE_CACHE_TTL}
+        self._cache_set(self.cache, cache_key, entry, CASE_CACHE_TTL + CASE_CACHE_GRACE)
+    
+    def _schedule_refresh(self, cache_key: str, case_number: str, court: str):
+        """Refresh a stale entry in the background, one refresh per key"""
+        with self._cache_lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+        
+        def _refresh():
+            try:
+                self._store_case(cache_key, self._fetch_case(case_number, court))
+            except Exception as e:
+                logger.warning(f"Background case refresh failed for {cache_key}: {e}")
+            finally:
+                with self._cache_lock:
+                    self._refreshing.discard(cache_key)
+        
+        threading.Thread(target=_refresh, daemon=True).start()
+    
+    def _make_session(self) -> aiohttp.ClientSession:
+        """Create an aiohttp session bound to the caller's event loop.
+
+        Sessions live and die inside one asyncio.run scope: caching one on
+        the instance would tie its connection pool to the first request's
+        loop, which is closed when that request ends, breaking every later
+        batch call. Within a batch the session still amortizes TCP/TLS
+        handshakes across all of its lookups.
+        """
+        return aiohttp.ClientSession(
+            headers={
+                'Authorization': f'Bearer {self.datajud_api_key}',
+                'Content-Type': 'application/json'
+            },
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+
+    async def search_case_async(
+        self, case_number: str, court: str,
+        session: Optional[aiohttp.ClientSession] = None
+    ) -> Dict[str, Any]:
+        """Async variant of search_case for event-loop callers"""
+        try:
+            cache_key = f"case:{court}:{case_number}"
+            entry = self._cache_get(self.cache, cache_key)
+            if entry is not None:
+                if time.time() >= entry['stale_after']:
+                    self._schedule_refresh(cache_key, case_number, court)
+                logger.info(f"Returning cached result for case {case_number}")
+                return entry['data']
+
             if self.datajud_api_key and self.datajud_api_key != 'your_datajud_api_key_here':
-                result = self._search_with_datajud(case_number, court)
+                if session is not None:
+                    result = await self._search_with_datajud_async(case_number, court, session)
+                else:
+                    async with self._make_session() as own_session:
+                        result = await self._search_with_datajud_async(case_number, court, own_session)
             else:
                 result = self._mock_case_search(case_number, court)
-            
-            # Cache the result
-            self.cache[cache_key] = {
-                'data': result,
-                'timestamp': datetime.now()
-            }
-            
+
+            self._store_case(cache_key, result)
+
             return result
-            
+
         except Exception as e:
             logger.error(f"Case search error: {e}")
             return self._mock_case_search(case_number, court)
-    
+
+    async def search_cases(self, queries: List[tuple]) -> List[Dict[str, Any]]:
+        """Search several cases concurrently.
+
+        queries is a list of (case_number, court) tuples; lookups are fanned
+        out with asyncio.gather, gated by a semaphore so DataJud sees at most
+        DATAJUD_MAX_CONCURRENCY requests in flight.
+        """
+        semaphore = asyncio.Semaphore(DATAJUD_MAX_CONCURRENCY)
+
+        async with self._make_session() as session:
+            async def _one(case_number: str, court: str) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self.search_case_async(case_number, court, session)
+
+            results = await asyncio.gather(
+                *[_one(case_number, court) for case_number, court in queries],
+                return_exceptions=True
+            )
+        return [
+            result if not isinstance(result, BaseException) else {'error': str(result)}
+            for result in results
+        ]
+
+    def search_cases_batch(self, queries: List[tuple]) -> List[Dict[str, Any]]:
+        """Synchronous entry point for batch case search from WSGI routes"""
+        return asyncio.run(self.search_cases(queries))
+
+    async def _search_with_datajud_async(
+        self, case_number: str, court: str, session: aiohttp.ClientSession
+    ) -> Dict[str, Any]:
+        """Search using DataJud API over the batch's aiohttp session"""
+        try:
+            url = f"{self.datajud_base_url}/api_publica_v2/processos"
+            params = {
+                'numeroProcesso': case_number,
+                'tribunal': court
+            }
+
+            async with session.get(url, params=params) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return self._parse_datajud_response(data, case_number, court)
+
+                logger.warning(f"DataJud API returned status {response.status}")
+                return self._mock_case_search(case_number, court)
+
+        except aiohttp.ClientError as e:
+            logger.error(f"DataJud API request error: {e}")
+            return self._mock_case_search(case_number, court)
+        except Exception as e:
+            logger.error(f"DataJud API error: {e}")
+            return self._mock_case_search(case_number, court)
+
     def _search_with_datajud(self, case_number: str, court: str) -> Dict[str, Any]:
         """Search using DataJud API"""
         try:
-            headers = {
-                'Authorization': f'Bearer {self.datajud_api_key}',
-                'Content-Type': 'application/json'
-            }
-            
             # DataJud API endpoint for case search
             url = f"{self.datajud_base_url}/api_publica_v2/processos"
             params = {
@@ -60,12 +336,7 @@ class CaseService:
                 'tribunal': court
             }
             
-            response = requests.get(
-                url,
-                headers=headers,
-                params=params,
-                timeout=self.timeout
-            )
+            response = self._http.get(url, params=params, timeout=self.timeout)
             
             if response.status_code == 200:
                 data = response.json()
@@ -120,43 +391,35 @@ class CaseService:
     
     def _extract_parties(self, case_data: Dict[str, Any]) -> List[str]:
         """Extract parties from case data"""
-        parties = []
         try:
-            if 'participantes' in case_data:
-                for participante in case_data['participantes']:
-                    nome = participante.get('nome', '')
-                    if nome and nome not in parties:
-                        parties.append(nome)
-            return parties[:10]  # Limit to 10 parties
+            # dict.fromkeys dedups in O(N) while preserving first-seen order
+            names = dict.fromkeys(
+                nome for participante in case_data.get('participantes', [])
+                if (nome := participante.get('nome', ''))
+            )
+            return list(names)[:10]  # Limit to 10 parties
         except Exception:
             return ['Parte não identificada']
     
     def _classify_movement_type(self, movement_name: str) -> str:
         """Classify movement type based on name"""
-        movement_name_lower = movement_name.lower()
-        
-        if any(word in movement_name_lower for word in ['sentença', 'decisão', 'acórdão']):
-            return 'decision'
-        elif any(word in movement_name_lower for word in ['audiência', 'sessão']):
-            return 'hearing'
-        elif any(word in movement_name_lower for word in ['prazo', 'intimação']):
-            return 'deadline'
-        else:
-            return 'filing'
+        match = _MOVEMENT_RE.search(movement_name)
+        if match:
+            for index, group in enumerate(match.groups()):
+                if group:
+                    return _MOVEMENT_TYPES[index]
+        return 'filing'
     
     def _parse_date(self, date_string: str) -> datetime:
         """Parse date string to datetime object"""
         try:
-            # Try different date formats
-            formats = [
-                '%Y-%m-%dT%H:%M:%S',
-                '%Y-%m-%d %H:%M:%S',
-                '%Y-%m-%d',
-                '%d/%m/%Y',
-                '%d/%m/%Y %H:%M:%S'
-            ]
+            # fromisoformat is native C and covers DataJud's ISO timestamps
+            try:
+                return datetime.fromisoformat(date_string.replace('Z', '+00:00'))
+            except ValueError:
+                pass
             
-            for fmt in formats:
+            for fmt in _DATE_FORMATS:
                 try:
                     return datetime.strptime(date_string, fmt)
                 except ValueError:
@@ -170,109 +433,63 @@ class CaseService:
     
     def _generate_mock_deadlines(self) -> List[Dict[str, Any]]:
         """Generate mock deadlines for demonstration"""
+        now = datetime.now()
         return [
             {
-                'id': '1',
-                'date': datetime.now() + timedelta(days=15),
-                'description': 'Prazo para manifestação',
-                'priority': 'medium',
-                'completed': False
-            },
-            {
-                'id': '2',
-                'date': datetime.now() + timedelta(days=30),
-                'description': 'Audiência de instrução',
-                'priority': 'high',
+                'id': deadline_id,
+                'date': now + timedelta(days=days),
+                'description': description,
+                'priority': priority,
                 'completed': False
             }
+            for deadline_id, days, description, priority in _DATAJUD_DEADLINES
         ]
     
     def _get_court_name(self, court_id: str) -> str:
         """Get full court name from ID"""
-        court_names = {
-            'tjsp': 'Tribunal de Justiça de São Paulo',
-            'stj': 'Superior Tribunal de Justiça',
-            'stf': 'Supremo Tribunal Federal',
-            'trf1': 'Tribunal Regional Federal da 1ª Região',
-            'trf2': 'Tribunal Regional Federal da 2ª Região',
-            'trf3': 'Tribunal Regional Federal da 3ª Região',
-            'trf4': 'Tribunal Regional Federal da 4ª Região',
-            'trf5': 'Tribunal Regional Federal da 5ª Região',
-            'tst': 'Tribunal Superior do Trabalho'
-        }
-        return court_names.get(court_id, court_id.upper())
+        return _COURT_NAMES.get(court_id, court_id.upper())
     
     def _mock_case_search(self, case_number: str, court: str) -> Dict[str, Any]:
         """Mock case search for development/fallback"""
+        now = datetime.now()
         return {
             'number': case_number,
             'court': self._get_court_name(court),
             'status': 'Em andamento',
             'parties': ['João Silva Santos', 'Empresa ABC Ltda.'],
             'subject': 'Ação de Cobrança',
-            'lastUpdate': datetime.now(),
+            'lastUpdate': now,
             'timeline': [
                 {
-                    'id': '1',
-                    'date': datetime.now() - timedelta(days=60),
-                    'description': 'Distribuição do processo',
-                    'type': 'filing'
-                },
-                {
-                    'id': '2',
-                    'date': datetime.now() - timedelta(days=45),
-                    'description': 'Citação da parte requerida',
-                    'type': 'filing'
-                },
-                {
-                    'id': '3',
-                    'date': datetime.now() - timedelta(days=30),
-                    'description': 'Apresentação de contestação',
-                    'type': 'filing'
-                },
-                {
-                    'id': '4',
-                    'date': datetime.now() - timedelta(days=15),
-                    'description': 'Despacho saneador',
-                    'type': 'decision'
-                },
-                {
-                    'id': '5',
-                    'date': datetime.now() - timedelta(days=5),
-                    'description': 'Designação de audiência de instrução',
-                    'type': 'hearing'
+                    'id': event_id,
+                    'date': now + timedelta(days=days),
+                    'description': description,
+                    'type': event_type
                 }
+                for event_id, days, description, event_type in _MOCK_TIMELINE
             ],
             'deadlines': [
                 {
-                    'id': '1',
-                    'date': datetime.now() + timedelta(days=10),
-                    'description': 'Audiência de instrução e julgamento',
-                    'priority': 'high',
-                    'completed': False
-                },
-                {
-                    'id': '2',
-                    'date': datetime.now() + timedelta(days=25),
-                    'description': 'Prazo para alegações finais',
-                    'priority': 'medium',
-                    'completed': False
-                },
-                {
-                    'id': '3',
-                    'date': datetime.now() + timedelta(days=40),
-                    'description': 'Prazo para sentença',
-                    'priority': 'low',
+                    'id': deadline_id,
+                    'date': now + timedelta(days=days),
+                    'description': description,
+                    'priority': priority,
                     'completed': False
                 }
+                for deadline_id, days, description, priority in _MOCK_DEADLINES
             ]
         }
     
     def get_court_statistics(self, court: str) -> Dict[str, Any]:
         """Get statistics for a specific court"""
         try:
+            cache_key = f"case_meta:{court}"
+            cached = self._cache_get(self.meta_cache, cache_key)
+            if cached is not None:
+                return cached
+
             # This would normally query court APIs or databases
-            return {
+            stats = {
                 'court': self._get_court_name(court),
                 'total_cases': 125000,
                 'pending_cases': 45000,
@@ -280,6 +497,10 @@ class CaseService:
                 'average_duration_days': 365,
                 'last_updated': datetime.now().isoformat()
             }
+
+            self._cache_set(self.meta_cache, cache_key, stats, META_CACHE_TTL)
+
+            return stats
         except Exception as e:
             logger.error(f"Error getting court statistics: {e}")
             return {
@@ -290,18 +511,21 @@ class CaseService:
     def validate_case_number(self, case_number: str) -> bool:
         """Validate Brazilian case number format"""
         try:
-            # Brazilian case number format: NNNNNNN-DD.AAAA.J.TR.OOOO
-            # Where N=sequential, D=verification digits, A=year, J=judicial segment,
-            # T=court, R=region, O=origin
-            
-            import re
-            pattern = r'^\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}$'
-            return bool(re.match(pattern, case_number))
-            
-        except Exception:
+            return _CASE_NUMBER_RE.match(case_number) is not None
+        except TypeError:
             return False
     
     def clear_cache(self):
-        """Clear the case search cache"""
-        self.cache.clear()
+        """Clear the case search and metadata caches"""
+        with self._cache_lock:
+            self.cache.clear()
+            self.meta_cache.clear()
+        if self.redis is not None:
+            try:
+                for pattern in ('case:*', 'case_meta:*'):
+                    keys = list(self.redis.scan_iter(match=pattern))
+                    if keys:
+                        self.redis.delete(*keys)
+            except redis.RedisError as e:
+                logger.warning(f"Redis cache clear failed: {e}")
         logger.info("Case search cache cleared")
\ No newline at end of file
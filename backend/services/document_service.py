@@ -1,15 +1,132 @@
 import os
+import sqlite3
+import threading
 import uuid
 import logging
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Dict, Any, Optional
 from datetime import datetime
-import json
 
-import PyPDF2
+import orjson
+from cachetools import LRUCache
+
+try:
+    from pypdf import PdfReader  # maintained successor to PyPDF2, faster extraction
+except ImportError:
+    from PyPDF2 import PdfReader
 from docx import Document as DocxDocument
 
 logger = logging.getLogger(__name__)
 
+
+# Text extraction runs in a process pool: PDF/DOCX parsing is CPU-bound, so
+# offloading it keeps web workers free and uses all cores under concurrent
+# uploads. The functions live at module level so they are picklable.
+
+_extract_pool: Optional[ProcessPoolExecutor] = None
+
+# Small pool for overlapping blocking disk writes with other work on the
+# upload path
+_io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='doc-io')
+
+def _write_text(filepath: str, text: str) -> None:
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+def _get_extract_pool() -> ProcessPoolExecutor:
+    global _extract_pool
+    if _extract_pool is None:
+        _extract_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _extract_pool
+
+def _extract_text(filepath: str) -> str:
+    """Extract text from various document formats"""
+    try:
+        file_extension = os.path.splitext(filepath)[1].lower()
+
+        if file_extension == '.pdf':
+            return _extract_pdf_text(filepath)
+        elif file_extension in ['.docx', '.doc']:
+            return _extract_docx_text(filepath)
+        elif file_extension == '.txt':
+            return _extract_txt_text(filepath)
+        else:
+            raise ValueError(f"Unsupported file format: {file_extension}")
+
+    except Exception as e:
+        logger.error(f"Text extraction error: {e}")
+        return f"Erro na extração de texto: {str(e)}"
+
+def _extract_pdf_text(filepath: str) -> str:
+    """Extract text from PDF file"""
+    try:
+        with open(filepath, 'rb') as file:
+            pdf_reader = PdfReader(file)
+            # Collect pages and join once: O(n) instead of quadratic +=
+            parts = [page.extract_text() or '' for page in pdf_reader.pages]
+        return "\n".join(parts).strip()
+    except Exception as e:
+        logger.error(f"PDF extraction error: {e}")
+        return f"Erro na extração do PDF: {str(e)}"
+
+_DOCX_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+def _extract_docx_text(filepath: str) -> str:
+    """Extract text from DOCX file"""
+    # Stream word/document.xml directly: for text-only extraction this is
+    # several times faster than building the full python-docx object model
+    try:
+        parts = []
+        with zipfile.ZipFile(filepath) as archive:
+            with archive.open('word/document.xml') as f:
+                for _, elem in ET.iterparse(f):
+                    if elem.tag == _DOCX_NS + 'p':
+                        parts.append(
+                            ''.join(t.text or '' for t in elem.iter(_DOCX_NS + 't'))
+                        )
+                        elem.clear()
+        return '\n'.join(parts).strip()
+    except Exception:
+        # python-docx handles unusual or slightly corrupted files better
+        try:
+            doc = DocxDocument(filepath)
+            return '\n'.join(p.text for p in doc.paragraphs).strip()
+        except Exception as e:
+            logger.error(f"DOCX extraction error: {e}")
+            return f"Erro na extração do DOCX: {str(e)}"
+
+def _extract_txt_text(filepath: str) -> str:
+    """Extract text from TXT file"""
+    # Read bytes once and sniff the encoding instead of decode-and-retry,
+    # which read non-UTF-8 files twice
+    try:
+        with open(filepath, 'rb') as file:
+            data = file.read()
+        
+        if data.startswith(b'\xef\xbb\xbf'):
+            return data[3:].decode('utf-8', errors='replace')
+        if data.isascii():
+            return data.decode('ascii')
+        
+        try:
+            return data.decode('utf-8')
+        except UnicodeDecodeError:
+            pass
+
+        # Non-UTF-8 Brazilian legal text is in practice cp1252/latin-1;
+        # generic charset sniffers guess Central-European codepages for
+        # Portuguese and silently corrupt the accented words
+        try:
+            return data.decode('cp1252')
+        except UnicodeDecodeError:
+            return data.decode('latin-1', errors='replace')
+    except Exception as e:
+        logger.error(f"TXT extraction error: {e}")
+        return f"Erro na leitura do arquivo: {str(e)}"
+
 class DocumentService:
     """Service for document processing and management"""
     
@@ -17,6 +134,10 @@ class DocumentService:
         self.storage_path = 'uploads'
         self.metadata_path = 'metadata'
         self._ensure_directories()
+        self._db_lock = threading.RLock()
+        self._db = self._initialize_db()
+        # Hot documents get re-analyzed repeatedly; keep their text in memory
+        self._content_cache = LRUCache(maxsize=256)
     
     def _ensure_directories(self):
         """Ensure required directories exist"""
@@ -24,33 +145,109 @@ class DocumentService:
             if not os.path.exists(path):
                 os.makedirs(path)
     
+    def _initialize_db(self) -> sqlite3.Connection:
+        """Open the SQLite metadata index (one row per document)"""
+        db = sqlite3.connect(
+            os.path.join(self.metadata_path, 'metadata.db'),
+            check_same_thread=False
+        )
+        db.row_factory = sqlite3.Row
+        # WAL lets readers proceed while a write is in flight
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS documents (
+                id TEXT PRIMARY KEY,
+                original_filename TEXT,
+                filepath TEXT,
+                ext TEXT,
+                content_length INTEGER,
+                processed_at TEXT,
+                status TEXT
+            )
+        """)
+        db.commit()
+        self._import_legacy_sidecars(db)
+        return db
+
+    def _import_legacy_sidecars(self, db: sqlite3.Connection):
+        """Fold pre-SQLite {id}.json metadata sidecars into the index.
+
+        Deployments upgraded from the sidecar layout keep their documents
+        visible: each sidecar is imported once and then removed, so the
+        scan is a no-op on every later startup.
+        """
+        try:
+            sidecars = [
+                name for name in os.listdir(self.metadata_path)
+                if name.endswith('.json') and not name.endswith('_analysis.json')
+            ]
+        except OSError as e:
+            logger.warning(f"Could not scan for legacy metadata sidecars: {e}")
+            return
+
+        imported = 0
+        for name in sidecars:
+            sidecar_path = os.path.join(self.metadata_path, name)
+            try:
+                with open(sidecar_path, 'rb') as f:
+                    metadata = orjson.loads(f.read())
+                original_filename = metadata.get('original_filename', '')
+                db.execute(
+                    'INSERT OR IGNORE INTO documents VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (
+                        metadata['id'],
+                        original_filename,
+                        metadata.get('filepath'),
+                        os.path.splitext(original_filename)[1].lower(),
+                        metadata.get('content_length', 0),
+                        metadata.get('processed_at'),
+                        metadata.get('status', 'processed')
+                    )
+                )
+                os.remove(sidecar_path)
+                imported += 1
+            except Exception as e:
+                logger.warning(f"Could not import metadata sidecar {name}: {e}")
+
+        if imported:
+            db.commit()
+            logger.info(f"Imported {imported} legacy metadata sidecars into SQLite")
+
     def process_document(self, filepath: str, original_filename: str) -> str:
         """Process uploaded document and return document ID"""
         try:
             document_id = str(uuid.uuid4())
             
-            # Extract text content
-            content = self._extract_text(filepath)
-            
-            # Create metadata
-            metadata = {
-                'id': document_id,
-                'original_filename': original_filename,
-                'filepath': filepath,
-                'content_length': len(content),
-                'processed_at': datetime.utcnow().isoformat(),
-                'status': 'processed'
-            }
-            
-            # Save metadata
-            metadata_file = os.path.join(self.metadata_path, f"{document_id}.json")
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, ensure_ascii=False, indent=2)
+            # Extract text content in the worker pool (inline if the pool
+            # is unavailable, e.g. after a worker crash)
+            try:
+                content = _get_extract_pool().submit(_extract_text, filepath).result()
+            except (BrokenProcessPool, OSError) as e:
+                logger.warning(f"Extraction pool unavailable, extracting inline: {e}")
+                content = _extract_text(filepath)
             
-            # Save extracted content
+            # Write the content file in the background while the metadata
+            # insert runs, then wait for both before acknowledging
             content_file = os.path.join(self.metadata_path, f"{document_id}_content.txt")
-            with open(content_file, 'w', encoding='utf-8') as f:
-                f.write(content)
+            content_write = _io_pool.submit(_write_text, content_file, content)
+            
+            # Index metadata
+            with self._db_lock:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (
+                        document_id,
+                        original_filename,
+                        filepath,
+                        os.path.splitext(original_filename)[1].lower(),
+                        len(content),
+                        datetime.utcnow().isoformat(),
+                        'processed'
+                    )
+                )
+                self._db.commit()
+            
+            content_write.result()
             
             logger.info(f"Document processed successfully: {document_id}")
             return document_id
@@ -59,73 +256,19 @@ class DocumentService:
             logger.error(f"Document processing error: {e}")
             raise
     
-    def _extract_text(self, filepath: str) -> str:
-        """Extract text from various document formats"""
-        try:
-            file_extension = os.path.splitext(filepath)[1].lower()
-            
-            if file_extension == '.pdf':
-                return self._extract_pdf_text(filepath)
-            elif file_extension in ['.docx', '.doc']:
-                return self._extract_docx_text(filepath)
-            elif file_extension == '.txt':
-                return self._extract_txt_text(filepath)
-            else:
-                raise ValueError(f"Unsupported file format: {file_extension}")
-                
-        except Exception as e:
-            logger.error(f"Text extraction error: {e}")
-            return f"Erro na extração de texto: {str(e)}"
-    
-    def _extract_pdf_text(self, filepath: str) -> str:
-        """Extract text from PDF file"""
-        try:
-            text = ""
-            with open(filepath, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-            return text.strip()
-        except Exception as e:
-            logger.error(f"PDF extraction error: {e}")
-            return f"Erro na extração do PDF: {str(e)}"
-    
-    def _extract_docx_text(self, filepath: str) -> str:
-        """Extract text from DOCX file"""
-        try:
-            doc = DocxDocument(filepath)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
-        except Exception as e:
-            logger.error(f"DOCX extraction error: {e}")
-            return f"Erro na extração do DOCX: {str(e)}"
-    
-    def _extract_txt_text(self, filepath: str) -> str:
-        """Extract text from TXT file"""
-        try:
-            with open(filepath, 'r', encoding='utf-8') as file:
-                return file.read()
-        except UnicodeDecodeError:
-            # Try with different encoding
-            try:
-                with open(filepath, 'r', encoding='latin-1') as file:
-                    return file.read()
-            except Exception as e:
-                logger.error(f"TXT extraction error: {e}")
-                return f"Erro na leitura do arquivo: {str(e)}"
-        except Exception as e:
-            logger.error(f"TXT extraction error: {e}")
-            return f"Erro na leitura do arquivo: {str(e)}"
-    
     def get_document_content(self, document_id: str) -> Optional[str]:
         """Get document content by ID"""
         try:
+            content = self._content_cache.get(document_id)
+            if content is not None:
+                return content
+            
             content_file = os.path.join(self.metadata_path, f"{document_id}_content.txt")
             if os.path.exists(content_file):
                 with open(content_file, 'r', encoding='utf-8') as f:
-                    return f.read()
+                    content = f.read()
+                self._content_cache[document_id] = content
+                return content
             return None
         except Exception as e:
             logger.error(f"Error getting document content: {e}")
@@ -134,11 +277,11 @@ class DocumentService:
     def get_document_metadata(self, document_id: str) -> Optional[Dict[str, Any]]:
         """Get document metadata by ID"""
         try:
-            metadata_file = os.path.join(self.metadata_path, f"{document_id}.json")
-            if os.path.exists(metadata_file):
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return None
+            with self._db_lock:
+                row = self._db.execute(
+                    'SELECT * FROM documents WHERE id = ?', (document_id,)
+                ).fetchone()
+            return dict(row) if row else None
         except Exception as e:
             logger.error(f"Error getting document metadata: {e}")
             return None
@@ -153,8 +296,8 @@ class DocumentService:
                 'created_at': datetime.utcnow().isoformat()
             }
             
-            with open(analysis_file, 'w', encoding='utf-8') as f:
-                json.dump(analysis_data, f, ensure_ascii=False, indent=2)
+            with open(analysis_file, 'wb') as f:
+                f.write(orjson.dumps(analysis_data, option=orjson.OPT_INDENT_2))
             
             return True
         except Exception as e:
@@ -166,9 +309,9 @@ class DocumentService:
         try:
             analysis_file = os.path.join(self.metadata_path, f"{document_id}_analysis.json")
             if os.path.exists(analysis_file):
-                with open(analysis_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return data.get('analysis')
+                with open(analysis_file, 'rb') as f:
+                    data = orjson.loads(f.read())
+                return data.get('analysis')
             return None
         except Exception as e:
             logger.error(f"Error getting analysis: {e}")
@@ -177,14 +320,11 @@ class DocumentService:
     def list_documents(self) -> list:
         """List all processed documents"""
         try:
-            documents = []
-            for filename in os.listdir(self.metadata_path):
-                if filename.endswith('.json') and not filename.endswith('_analysis.json'):
-                    document_id = filename.replace('.json', '')
-                    metadata = self.get_document_metadata(document_id)
-                    if metadata:
-                        documents.append(metadata)
-            return documents
+            with self._db_lock:
+                rows = self._db.execute(
+                    'SELECT * FROM documents ORDER BY processed_at'
+                ).fetchall()
+            return [dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error listing documents: {e}")
             return []
@@ -193,14 +333,13 @@ class DocumentService:
         """Delete a document and its associated files"""
         try:
             files_to_delete = [
-                os.path.join(self.metadata_path, f"{document_id}.json"),
                 os.path.join(self.metadata_path, f"{document_id}_content.txt"),
                 os.path.join(self.metadata_path, f"{document_id}_analysis.json")
             ]
             
             # Get original file path from metadata
             metadata = self.get_document_metadata(document_id)
-            if metadata and 'filepath' in metadata:
+            if metadata and metadata.get('filepath'):
                 files_to_delete.append(metadata['filepath'])
             
             # Delete files
@@ -208,6 +347,11 @@ class DocumentService:
                 if os.path.exists(filepath):
                     os.remove(filepath)
             
+            with self._db_lock:
+                self._db.execute('DELETE FROM documents WHERE id = ?', (document_id,))
+                self._db.commit()
+            self._content_cache.pop(document_id, None)
+            
             logger.info(f"Document deleted: {document_id}")
             return True
             
@@ -218,24 +362,19 @@ class DocumentService:
     def get_document_stats(self) -> Dict[str, Any]:
         """Get statistics about processed documents"""
         try:
-            documents = self.list_documents()
-            total_size = 0
-            file_types = {}
-            
-            for doc in documents:
-                # Count file types
-                if 'original_filename' in doc:
-                    ext = os.path.splitext(doc['original_filename'])[1].lower()
-                    file_types[ext] = file_types.get(ext, 0) + 1
-                
-                # Sum content lengths
-                if 'content_length' in doc:
-                    total_size += doc['content_length']
+            with self._db_lock:
+                totals = self._db.execute(
+                    'SELECT COUNT(*) AS n, COALESCE(SUM(content_length), 0) AS size'
+                    ' FROM documents'
+                ).fetchone()
+                type_rows = self._db.execute(
+                    'SELECT ext, COUNT(*) AS n FROM documents GROUP BY ext'
+                ).fetchall()
             
             return {
-                'total_documents': len(documents),
-                'total_content_size': total_size,
-                'file_types': file_types,
+                'total_documents': totals['n'],
+                'total_content_size': totals['size'],
+                'file_types': {row['ext']: row['n'] for row in type_rows},
                 'last_updated': datetime.utcnow().isoformat()
             }
             
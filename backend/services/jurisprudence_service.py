@@ -1,13 +1,161 @@
 import os
+import hashlib
 import logging
+import threading
+import time
+import msgpack
+import redis
 import requests
+from concurrent.futures import Future, ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from cachetools import TTLCache
+from cachetools.keys import hashkey
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
+import heapq
 import json
 import re
 
+try:
+    import ahocorasick  # C automaton; matches all legal terms in one pass
+except ImportError:
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+# Compiled once at import; _sanitize_query runs on every search
+_QUERY_STRIP_RE = re.compile(r'[<>"\']')
+
+# The two date shapes the API returns (ISO and BR, optional time); one match
+# plus direct datetime() construction is ~10x faster than strptime attempts
+_DATE_RE = re.compile(
+    r'^(\d{4})-(\d{2})-(\d{2})(?:[T ](\d{2}):(\d{2}):(\d{2}))?$'
+    r'|^(\d{2})/(\d{2})/(\d{4})(?:\s+(\d{2}):(\d{2}):(\d{2}))?$'
+)
+
+# Common legal terms and concepts mapped to their display tags
+_LEGAL_TERMS = {
+    'danos morais': 'Danos Morais',
+    'responsabilidade civil': 'Responsabilidade Civil',
+    'direito do consumidor': 'Direito do Consumidor',
+    'contrato': 'Contratos',
+    'inadimplemento': 'Inadimplemento',
+    'rescisão': 'Rescisão Contratual',
+    'indenização': 'Indenização',
+    'dignidade humana': 'Dignidade Humana',
+    'boa-fé': 'Boa-fé',
+    'função social': 'Função Social',
+    'cláusula abusiva': 'Cláusulas Abusivas',
+    'direito fundamental': 'Direitos Fundamentais',
+    'devido processo legal': 'Devido Processo Legal',
+    'ampla defesa': 'Ampla Defesa',
+    'contraditório': 'Contraditório',
+    'prescrição': 'Prescrição',
+    'decadência': 'Decadência'
+}
+
+# Canned mock results, built once at import; _mock_jurisprudence_search only
+# selects and ranks them instead of reallocating the dict literals per call
+_MOCK_MORAIS = (
+    {
+        'id': '1',
+        'court': 'Superior Tribunal de Justiça',
+        'date': datetime(2024, 1, 15),
+        'summary': 'Responsabilidade civil por danos morais em relações de consumo. Configuração do dano moral presumido quando há defeito na prestação de serviço.',
+        'decision': 'RECURSO ESPECIAL. DIREITO DO CONSUMIDOR. DANOS MORAIS. DEFEITO NA PRESTAÇÃO DE SERVIÇO. DANO MORAL PRESUMIDO. O dano moral decorrente de defeito na prestação de serviço é presumido, dispensando prova específica do prejuízo, bastando a demonstração do defeito e do nexo causal.',
+        'relevance': 95,
+        'tags': ['Danos Morais', 'Direito do Consumidor', 'Responsabilidade Civil']
+    },
+    {
+        'id': '2',
+        'court': 'Tribunal de Justiça de São Paulo',
+        'date': datetime(2024, 2, 10),
+        'summary': 'Danos morais por negativação indevida. Valor da indenização deve observar critérios de proporcionalidade e razoabilidade.',
+        'decision': 'APELAÇÃO CÍVEL. DANOS MORAIS. NEGATIVAÇÃO INDEVIDA. QUANTUM INDENIZATÓRIO. A fixação do valor da indenização por danos morais deve observar os critérios de proporcionalidade e razoabilidade, considerando a extensão do dano e a capacidade econômica das partes.',
+        'relevance': 88,
+        'tags': ['Danos Morais', 'Negativação', 'Indenização']
+    }
+)
+
+_MOCK_CONTRATO = (
+    {
+        'id': '3',
+        'court': 'Supremo Tribunal Federal',
+        'date': datetime(2024, 3, 5),
+        'summary': 'Função social dos contratos. Limitação da autonomia privada pelos princípios constitucionais.',
+        'decision': 'AÇÃO DIRETA DE INCONSTITUCIONALIDADE. CONTRATOS. FUNÇÃO SOCIAL. AUTONOMIA PRIVADA. A função social dos contratos, prevista no art. 421 do Código Civil, impõe limitações à autonomia privada, devendo os contratos atender não apenas aos interesses das partes, mas também aos valores sociais.',
+        'relevance': 92,
+        'tags': ['Contratos', 'Função Social', 'Autonomia Privada']
+    },
+)
+
+_MOCK_CDC = (
+    {
+        'id': '4',
+        'court': 'Superior Tribunal de Justiça',
+        'date': datetime(2024, 1, 20),
+        'summary': 'Relação de consumo. Inversão do ônus da prova. Aplicação do Código de Defesa do Consumidor.',
+        'decision': 'RECURSO ESPECIAL. DIREITO DO CONSUMIDOR. INVERSÃO DO ÔNUS DA PROVA. CDC. A inversão do ônus da prova prevista no art. 6º, VIII, do CDC é direito básico do consumidor e deve ser aplicada quando presentes a verossimilhança das alegações ou a hipossuficiência do consumidor.',
+        'relevance': 90,
+        'tags': ['Direito do Consumidor', 'Inversão do Ônus', 'CDC']
+    },
+)
+
+_MOCK_DEFAULT = (
+    {
+        'id': '5',
+        'court': 'Tribunal de Justiça do Rio de Janeiro',
+        'date': datetime(2024, 2, 25),
+        'summary': 'Princípio da dignidade da pessoa humana. Aplicação em casos concretos do direito civil.',
+        'decision': 'APELAÇÃO CÍVEL. DIGNIDADE DA PESSOA HUMANA. DIREITO CIVIL. O princípio da dignidade da pessoa humana constitui fundamento da República e deve ser observado em todas as relações jurídicas, inclusive nas de direito privado.',
+        'relevance': 85,
+        'tags': ['Dignidade Humana', 'Direitos Fundamentais']
+    },
+    {
+        'id': '6',
+        'court': 'Tribunal Regional Federal da 3ª Região',
+        'date': datetime(2024, 3, 15),
+        'summary': 'Devido processo legal. Garantias constitucionais do processo.',
+        'decision': 'APELAÇÃO. DEVIDO PROCESSO LEGAL. GARANTIAS CONSTITUCIONAIS. O devido processo legal compreende não apenas o aspecto formal (procedural due process), mas também o aspecto material (substantive due process), garantindo a justiça das decisões.',
+        'relevance': 82,
+        'tags': ['Devido Processo Legal', 'Garantias Constitucionais']
+    }
+)
+
+# Keyword -> result bucket dispatch for the mock search; matching is one set
+# intersection against the query's tokens instead of substring scans, so the
+# sets spell out the inflected forms the substrings used to cover
+_MOCK_BUCKETS = (
+    (frozenset({'moral', 'morais'}), _MOCK_MORAIS),
+    (frozenset({'contrato', 'contratos', 'contratual', 'contractual'}), _MOCK_CONTRATO),
+    (frozenset({'consumidor', 'cdc'}), _MOCK_CDC)
+)
+
+_MIN_RELEVANCE = {
+    'high': 90,
+    'medium': 70,
+    'low': 50
+}
+
+# Aho-Corasick automaton built once at import: one O(len(text)) scan finds
+# every term, instead of one substring pass per term
+if ahocorasick is not None:
+    _TAG_AUTOMATON = ahocorasick.Automaton()
+    for _term, _tag in _LEGAL_TERMS.items():
+        _TAG_AUTOMATON.add_word(_term, _tag)
+    _TAG_AUTOMATON.make_automaton()
+else:
+    _TAG_AUTOMATON = None
+
+def _msgpack_default(obj):
+    # Naive datetimes (datetime.now() is used throughout) would otherwise
+    # bypass the timestamp extension and flatten to strings on the Redis
+    # tier only; the local offset makes them pack and unpack as datetimes
+    if isinstance(obj, datetime):
+        return obj.astimezone()
+    return str(obj)
+
 class JurisprudenceService:
     """Service for Brazilian jurisprudence search and analysis"""
     
@@ -15,8 +163,85 @@ class JurisprudenceService:
         self.api_key = os.getenv('JURISPRUDENCE_API_KEY')
         self.base_url = os.getenv('JURISPRUDENCE_BASE_URL', 'https://jurisprudencia.stf.jus.br')
         self.timeout = 30
-        self.cache = {}  # Simple in-memory cache
+        # Bounded LRU+TTL cache: hot queries stay resident, cold ones evict,
+        # and expiry is handled natively instead of per-read timestamp checks
+        self.cache = TTLCache(maxsize=1024, ttl=7200)
+        self.stats = {'hits': 0, 'misses': 0}
+        # Redis, when reachable, shares hits across gunicorn workers; the
+        # TTLCache stays as the per-process fallback
+        self.redis = self._initialize_redis()
+        # Coalesce concurrent identical queries: the first caller fetches,
+        # the rest wait on the same Future instead of going upstream
+        self._inflight: Dict[Any, Future] = {}
+        self._inflight_lock = threading.Lock()
+        # Trends change slowly; memoize the payload for 5 minutes
+        self._trends_cache = {'data': None, 'expires': 0.0}
+        # Keep-alive session: reuses TCP/TLS connections across API calls
+        # and retries transient upstream failures with backoff
+        self.session = requests.Session()
+        self.session.mount(
+            'https://',
+            HTTPAdapter(
+                pool_connections=8,
+                pool_maxsize=32,
+                # Retry only connection-level failures with exponential
+                # backoff; HTTP error statuses fall through to the mock
+                # fallback instead of hammering a flapping upstream
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.5,
+                    status_forcelist=[],
+                    allowed_methods=['GET'],
+                    raise_on_status=False
+                )
+            )
+        )
     
+    def _initialize_redis(self) -> Optional[redis.Redis]:
+        """Connect to Redis for a cache shared across workers"""
+        try:
+            redis_url = os.getenv('REDIS_URL')
+            if not redis_url:
+                return None
+            client = redis.Redis.from_url(redis_url)
+            client.ping()
+            logger.info("Jurisprudence cache backed by Redis")
+            return client
+        except Exception as e:
+            logger.warning(f"Redis unavailable for jurisprudence cache, using in-memory: {e}")
+            return None
+
+    @staticmethod
+    def _redis_key(cache_key) -> str:
+        """Digest the hashkey tuple into a stable Redis key"""
+        return 'juris:' + hashlib.blake2b(repr(cache_key).encode(), digest_size=16).hexdigest()
+
+    def _cache_get(self, cache_key) -> Optional[List[Dict[str, Any]]]:
+        """Read cached results from Redis, falling back to the local cache"""
+        if self.redis is not None:
+            try:
+                raw = self.redis.get(self._redis_key(cache_key))
+                if raw is not None:
+                    return msgpack.unpackb(raw, timestamp=3, raw=False)
+                return None
+            except redis.RedisError as e:
+                logger.warning(f"Redis cache read failed: {e}")
+        return self.cache.get(cache_key)
+
+    def _cache_set(self, cache_key, results: List[Dict[str, Any]]):
+        """Store results in Redis (shared) or the local cache (fallback)"""
+        if self.redis is not None:
+            try:
+                packed = msgpack.packb(
+                    results, datetime=True, use_bin_type=True,
+                    default=_msgpack_default
+                )
+                self.redis.set(self._redis_key(cache_key), packed, ex=7200)
+                return
+            except redis.RedisError as e:
+                logger.warning(f"Redis cache write failed: {e}")
+        self.cache[cache_key] = results
+
     def search(self, query: str, filters: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """Search for jurisprudence based on query and filters"""
         try:
@@ -27,23 +252,40 @@ class JurisprudenceService:
             
             # Check cache first
             cache_key = self._generate_cache_key(query, filters)
-            if cache_key in self.cache:
-                cached_result = self.cache[cache_key]
-                if datetime.now() - cached_result['timestamp'] < timedelta(hours=2):
-                    logger.info(f"Returning cached jurisprudence results for query: {query}")
-                    return cached_result['data']
+            results = self._cache_get(cache_key)
+            if results is not None:
+                self.stats['hits'] += 1
+                logger.info(f"Returning cached jurisprudence results for query: {query}")
+                return results
+            self.stats['misses'] += 1
             
-            # Perform search
-            if self.api_key and self.api_key != 'your_jurisprudence_api_key_here':
-                results = self._search_with_api(query, filters)
-            else:
-                results = self._mock_jurisprudence_search(query, filters)
+            # Coalesce with any identical in-flight search
+            with self._inflight_lock:
+                future = self._inflight.get(cache_key)
+                owner = future is None
+                if owner:
+                    future = Future()
+                    self._inflight[cache_key] = future
             
-            # Cache the results
-            self.cache[cache_key] = {
-                'data': results,
-                'timestamp': datetime.now()
-            }
+            if not owner:
+                return future.result(timeout=self.timeout)
+            
+            try:
+                # Perform search
+                if self.api_key and self.api_key != 'your_jurisprudence_api_key_here':
+                    results = self._search_with_api(query, filters)
+                else:
+                    results = self._mock_jurisprudence_search(query, filters)
+                
+                # Cache the results
+                self._cache_set(cache_key, results)
+                future.set_result(results)
+            except Exception as e:
+                future.set_exception(e)
+                raise
+            finally:
+                with self._inflight_lock:
+                    self._inflight.pop(cache_key, None)
             
             return results
             
@@ -51,13 +293,18 @@ class JurisprudenceService:
             logger.error(f"Jurisprudence search error: {e}")
             return self._mock_jurisprudence_search(query, filters)
     
+    def search_many(self, queries: List[str], filters: Dict[str, Any] = None) -> List[List[Dict[str, Any]]]:
+        """Run several searches concurrently over the pooled session"""
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            return list(executor.map(lambda q: self.search(q, filters), queries))
+    
     def _sanitize_query(self, query: str) -> str:
         """Sanitize search query"""
         if not query:
             return ""
         
         # Remove potentially harmful characters
-        query = re.sub(r'[<>"\']', '', query)
+        query = _QUERY_STRIP_RE.sub('', query)
         
         # Limit length
         query = query[:500]
@@ -67,14 +314,14 @@ class JurisprudenceService:
         
         return query.strip()
     
-    def _generate_cache_key(self, query: str, filters: Dict[str, Any] = None) -> str:
+    def _generate_cache_key(self, query: str, filters: Dict[str, Any] = None):
         """Generate cache key for query and filters"""
-        key_parts = [query]
-        if filters:
-            for key, value in sorted(filters.items()):
-                if value:
-                    key_parts.append(f"{key}:{value}")
-        return "_".join(key_parts)
+        # str() per value keeps the key hashable whatever the caller's JSON
+        # carried (lists, nested dicts), as the old string-concat key did
+        return hashkey(
+            query,
+            tuple(sorted((k, str(v)) for k, v in (filters or {}).items()))
+        )
     
     def _search_with_api(self, query: str, filters: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """Search using external jurisprudence API"""
@@ -99,7 +346,7 @@ class JurisprudenceService:
                     params['relevancia'] = filters['relevance']
             
             # Make API request
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/api/search",
                 headers=headers,
                 params=params,
@@ -113,6 +360,10 @@ class JurisprudenceService:
                 logger.warning(f"Jurisprudence API returned status {response.status_code}")
                 return self._mock_jurisprudence_search(query, filters)
                 
+        except (requests.ConnectionError, requests.Timeout) as e:
+            # Already retried with backoff at the adapter level
+            logger.error(f"Jurisprudence API unreachable after retries: {e}")
+            return self._mock_jurisprudence_search(query, filters)
         except requests.RequestException as e:
             logger.error(f"Jurisprudence API request error: {e}")
             return self._mock_jurisprudence_search(query, filters)
@@ -147,20 +398,20 @@ class JurisprudenceService:
     def _parse_date(self, date_string: str) -> datetime:
         """Parse date string to datetime object"""
         try:
-            formats = [
-                '%Y-%m-%d',
-                '%d/%m/%Y',
-                '%Y-%m-%dT%H:%M:%S',
-                '%d/%m/%Y %H:%M:%S'
-            ]
+            match = _DATE_RE.match(date_string)
+            if not match:
+                return datetime.now()
             
-            for fmt in formats:
-                try:
-                    return datetime.strptime(date_string, fmt)
-                except ValueError:
-                    continue
+            groups = match.groups()
+            if groups[0] is not None:  # ISO: YYYY-MM-DD[ T]HH:MM:SS
+                year, month, day, hour, minute, second = groups[:6]
+            else:  # BR: DD/MM/YYYY HH:MM:SS
+                day, month, year, hour, minute, second = groups[6:]
             
-            return datetime.now()
+            return datetime(
+                int(year), int(month), int(day),
+                int(hour or 0), int(minute or 0), int(second or 0)
+            )
             
         except Exception:
             return datetime.now()
@@ -169,30 +420,20 @@ class JurisprudenceService:
         """Extract relevant tags from jurisprudence text"""
         try:
             text_lower = text.lower()
+            tags = []
             
-            # Common legal terms and concepts
-            legal_terms = {
-                'danos morais': 'Danos Morais',
-                'responsabilidade civil': 'Responsabilidade Civil',
-                'direito do consumidor': 'Direito do Consumidor',
-                'contrato': 'Contratos',
-                'inadimplemento': 'Inadimplemento',
-                'rescisão': 'Rescisão Contratual',
-                'indenização': 'Indenização',
-                'dignidade humana': 'Dignidade Humana',
-                'boa-fé': 'Boa-fé',
-                'função social': 'Função Social',
-                'cláusula abusiva': 'Cláusulas Abusivas',
-                'direito fundamental': 'Direitos Fundamentais',
-                'devido processo legal': 'Devido Processo Legal',
-                'ampla defesa': 'Ampla Defesa',
-                'contraditório': 'Contraditório',
-                'prescrição': 'Prescrição',
-                'decadência': 'Decadência'
-            }
+            if _TAG_AUTOMATON is not None:
+                seen = set()
+                for _, tag in _TAG_AUTOMATON.iter(text_lower):
+                    if tag not in seen:
+                        seen.add(tag)
+                        tags.append(tag)
+                        if len(tags) == 5:
+                            break
+                return tags
             
-            tags = []
-            for term, tag in legal_terms.items():
+            # Fallback: one substring pass per term
+            for term, tag in _LEGAL_TERMS.items():
                 if term in text_lower:
                     tags.append(tag)
             
@@ -205,98 +446,33 @@ class JurisprudenceService:
     def _mock_jurisprudence_search(self, query: str, filters: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """Mock jurisprudence search for development/fallback"""
         
-        # Generate different results based on query keywords
-        base_results = []
-        
-        if any(term in query.lower() for term in ['danos morais', 'moral']):
-            base_results.extend([
-                {
-                    'id': '1',
-                    'court': 'Superior Tribunal de Justiça',
-                    'date': datetime(2024, 1, 15),
-                    'summary': 'Responsabilidade civil por danos morais em relações de consumo. Configuração do dano moral presumido quando há defeito na prestação de serviço.',
-                    'decision': 'RECURSO ESPECIAL. DIREITO DO CONSUMIDOR. DANOS MORAIS. DEFEITO NA PRESTAÇÃO DE SERVIÇO. DANO MORAL PRESUMIDO. O dano moral decorrente de defeito na prestação de serviço é presumido, dispensando prova específica do prejuízo, bastando a demonstração do defeito e do nexo causal.',
-                    'relevance': 95,
-                    'tags': ['Danos Morais', 'Direito do Consumidor', 'Responsabilidade Civil']
-                },
-                {
-                    'id': '2',
-                    'court': 'Tribunal de Justiça de São Paulo',
-                    'date': datetime(2024, 2, 10),
-                    'summary': 'Danos morais por negativação indevida. Valor da indenização deve observar critérios de proporcionalidade e razoabilidade.',
-                    'decision': 'APELAÇÃO CÍVEL. DANOS MORAIS. NEGATIVAÇÃO INDEVIDA. QUANTUM INDENIZATÓRIO. A fixação do valor da indenização por danos morais deve observar os critérios de proporcionalidade e razoabilidade, considerando a extensão do dano e a capacidade econômica das partes.',
-                    'relevance': 88,
-                    'tags': ['Danos Morais', 'Negativação', 'Indenização']
-                }
-            ])
-        
-        if any(term in query.lower() for term in ['contrato', 'contractual']):
-            base_results.extend([
-                {
-                    'id': '3',
-                    'court': 'Supremo Tribunal Federal',
-                    'date': datetime(2024, 3, 5),
-                    'summary': 'Função social dos contratos. Limitação da autonomia privada pelos princípios constitucionais.',
-                    'decision': 'AÇÃO DIRETA DE INCONSTITUCIONALIDADE. CONTRATOS. FUNÇÃO SOCIAL. AUTONOMIA PRIVADA. A função social dos contratos, prevista no art. 421 do Código Civil, impõe limitações à autonomia privada, devendo os contratos atender não apenas aos interesses das partes, mas também aos valores sociais.',
-                    'relevance': 92,
-                    'tags': ['Contratos', 'Função Social', 'Autonomia Privada']
-                }
-            ])
-        
-        if any(term in query.lower() for term in ['consumidor', 'cdc']):
-            base_results.extend([
-                {
-                    'id': '4',
-                    'court': 'Superior Tribunal de Justiça',
-                    'date': datetime(2024, 1, 20),
-                    'summary': 'Relação de consumo. Inversão do ônus da prova. Aplicação do Código de Defesa do Consumidor.',
-                    'decision': 'RECURSO ESPECIAL. DIREITO DO CONSUMIDOR. INVERSÃO DO ÔNUS DA PROVA. CDC. A inversão do ônus da prova prevista no art. 6º, VIII, do CDC é direito básico do consumidor e deve ser aplicada quando presentes a verossimilhança das alegações ou a hipossuficiência do consumidor.',
-                    'relevance': 90,
-                    'tags': ['Direito do Consumidor', 'Inversão do Ônus', 'CDC']
-                }
-            ])
+        # Select result buckets by query keywords: lower and tokenize once,
+        # then each bucket costs a single set intersection
+        query_tokens = set(query.lower().split())
+        results = [
+            result
+            for keywords, bucket in _MOCK_BUCKETS
+            if keywords & query_tokens
+            for result in bucket
+        ]
         
         # Default results if no specific keywords found
-        if not base_results:
-            base_results = [
-                {
-                    'id': '5',
-                    'court': 'Tribunal de Justiça do Rio de Janeiro',
-                    'date': datetime(2024, 2, 25),
-                    'summary': 'Princípio da dignidade da pessoa humana. Aplicação em casos concretos do direito civil.',
-                    'decision': 'APELAÇÃO CÍVEL. DIGNIDADE DA PESSOA HUMANA. DIREITO CIVIL. O princípio da dignidade da pessoa humana constitui fundamento da República e deve ser observado em todas as relações jurídicas, inclusive nas de direito privado.',
-                    'relevance': 85,
-                    'tags': ['Dignidade Humana', 'Direitos Fundamentais']
-                },
-                {
-                    'id': '6',
-                    'court': 'Tribunal Regional Federal da 3ª Região',
-                    'date': datetime(2024, 3, 15),
-                    'summary': 'Devido processo legal. Garantias constitucionais do processo.',
-                    'decision': 'APELAÇÃO. DEVIDO PROCESSO LEGAL. GARANTIAS CONSTITUCIONAIS. O devido processo legal compreende não apenas o aspecto formal (procedural due process), mas também o aspecto material (substantive due process), garantindo a justiça das decisões.',
-                    'relevance': 82,
-                    'tags': ['Devido Processo Legal', 'Garantias Constitucionais']
-                }
-            ]
+        if not results:
+            results = list(_MOCK_DEFAULT)
         
-        # Apply filters
+        # Apply filters; only a string court can be substring-matched, so
+        # other JSON shapes leave the filter unapplied instead of raising
         if filters:
-            if filters.get('court'):
-                court_filter = filters['court']
-                base_results = [r for r in base_results if court_filter in r['court'].lower()]
+            court_filter = filters.get('court')
+            if court_filter and isinstance(court_filter, str):
+                results = [r for r in results if court_filter in r['court'].lower()]
             
             if filters.get('relevance'):
-                min_relevance = {
-                    'high': 90,
-                    'medium': 70,
-                    'low': 50
-                }.get(filters['relevance'], 0)
-                base_results = [r for r in base_results if r['relevance'] >= min_relevance]
+                min_relevance = _MIN_RELEVANCE.get(filters['relevance'], 0)
+                results = [r for r in results if r['relevance'] >= min_relevance]
         
-        # Sort by relevance
-        base_results.sort(key=lambda x: x['relevance'], reverse=True)
-        
-        return base_results[:10]  # Limit to 10 results
+        # Top 10 by relevance: nlargest is O(n log 10) vs a full sort
+        return heapq.nlargest(10, results, key=lambda x: x['relevance'])
     
     def get_related_cases(self, case_id: str) -> List[Dict[str, Any]]:
         """Get cases related to a specific jurisprudence entry"""
@@ -318,7 +494,11 @@ class JurisprudenceService:
     def get_jurisprudence_trends(self) -> Dict[str, Any]:
         """Get trending topics in jurisprudence"""
         try:
-            return {
+            now = time.monotonic()
+            if now < self._trends_cache['expires']:
+                return self._trends_cache['data']
+            
+            trends = {
                 'trending_topics': [
                     {'topic': 'Danos Morais', 'count': 1250, 'growth': '+15%'},
                     {'topic': 'Direito do Consumidor', 'count': 980, 'growth': '+8%'},
@@ -332,11 +512,33 @@ class JurisprudenceService:
                 ],
                 'last_updated': datetime.now().isoformat()
             }
+            
+            self._trends_cache = {'data': trends, 'expires': now + 300}
+            return trends
         except Exception as e:
             logger.error(f"Error getting jurisprudence trends: {e}")
             return {'error': str(e)}
     
     def clear_cache(self):
         """Clear the jurisprudence search cache"""
+        hits, misses = self.stats['hits'], self.stats['misses']
+        total = hits + misses
+        hit_rate = (hits / total * 100) if total else 0.0
         self.cache.clear()
-        logger.info("Jurisprudence search cache cleared")
\ No newline at end of file
+        if self.redis is not None:
+            try:
+                keys = list(self.redis.scan_iter(match='juris:*'))
+                if keys:
+                    self.redis.delete(*keys)
+            except redis.RedisError as e:
+                logger.warning(f"Redis cache clear failed: {e}")
+        self.stats = {'hits': 0, 'misses': 0}
+        # Clear the in-flight map in place under its lock: rebinding either
+        # would strand concurrent searches on objects nobody consults
+        with self._inflight_lock:
+            self._inflight.clear()
+        self._trends_cache = {'data': None, 'expires': 0.0}
+        logger.info(
+            f"Jurisprudence search cache cleared "
+            f"(hit rate {hit_rate:.1f}% over {total} lookups)"
+        )
\ No newline at end of file
@@ -0,0 +1,85 @@
+import os
+import logging
+
+from celery import Celery
+from celery.signals import worker_process_init
+from dotenv import load_dotenv
+
+from services.ai_service import AIService
+from services.document_service import DocumentService
+
+logger = logging.getLogger(__name__)
+
+# Workers start via `celery -A tasks worker` and never import app.py, so
+# config/.env (API keys, REDIS_URL) must be loaded here; load_dotenv does
+# not override variables already set in the environment
+load_dotenv('../config/.env')
+
+# Broker/backend default to the shared Redis instance
+_BROKER_URL = os.getenv('CELERY_BROKER_URL', os.getenv('REDIS_URL', 'redis://localhost:6379/0'))
+_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', _BROKER_URL)
+
+celery_app = Celery('jurisai', broker=_BROKER_URL, backend=_RESULT_BACKEND)
+
+# Route API-bound AI work to a dedicated queue so it can be scaled
+# independently from any CPU-bound workers
+celery_app.conf.task_routes = {
+    'tasks.run_analysis': {'queue': 'ai'},
+    'tasks.run_mindmap': {'queue': 'ai'},
+    'tasks.run_contract_analysis': {'queue': 'ai'},
+}
+
+# Worker-local service instances, created lazily: web workers import this
+# module only to dispatch tasks and should not pay for a second OpenAI
+# warm-up, Redis connection and SQLite handle they never use
+ai_service = None
+document_service = None
+
+
+def _get_services():
+    global ai_service, document_service
+    if ai_service is None:
+        ai_service = AIService()
+        document_service = DocumentService()
+    return ai_service, document_service
+
+
+@worker_process_init.connect
+def _init_worker_services(**kwargs):
+    """Warm the service instances when a worker process boots"""
+    _get_services()
+
+
+@celery_app.task(name='tasks.run_analysis')
+def run_analysis(document_id: str, analysis_type: str = 'general'):
+    """Run document analysis on a worker instead of the request thread"""
+    ai, documents = _get_services()
+    content = documents.get_document_content(document_id)
+    if not content:
+        return {'error': 'Document not found'}
+
+    result = ai.analyze_document(content, analysis_type)
+    documents.store_analysis(document_id, result)
+    return result
+
+
+@celery_app.task(name='tasks.run_mindmap')
+def run_mindmap(document_id: str):
+    """Generate a document mindmap on a worker"""
+    ai, documents = _get_services()
+    content = documents.get_document_content(document_id)
+    if not content:
+        return {'error': 'Document not found'}
+
+    return ai.generate_mindmap(content)
+
+
+@celery_app.task(name='tasks.run_contract_analysis')
+def run_contract_analysis(document_id: str):
+    """Run contract analysis on a worker"""
+    ai, documents = _get_services()
+    content = documents.get_document_content(document_id)
+    if not content:
+        return {'error': 'Document not found'}
+
+    return ai.analyze_contract(content)